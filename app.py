@@ -5,13 +5,17 @@ All-in-one Streamlit application
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
 import io
 
+from src.analysis import calculate_correlation, group_and_aggregate, top_n_records
+from src.caching import load_or_generate
+from src.data_loader import detect_column_types
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 # Page configuration
 st.set_page_config(
     page_title="Sales Analytics Platform",
@@ -39,32 +43,41 @@ st.markdown("""
 # DEMO DATA FUNCTIONS
 # ============================================================================
 
+def downcast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink int64 columns to int32; floats stay float64 to keep exact cents."""
+    int_cols = df.select_dtypes(include=['int64']).columns
+    df[int_cols] = df[int_cols].astype(np.int32)
+    return df
+
+
+@st.cache_data(show_spinner=False)
 def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
     """Generate comprehensive demo sales data."""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
-    start_date = datetime(2023, 1, 1)
-    dates = [start_date + timedelta(days=int(x)) for x in np.sort(np.random.rand(n_records) * 365)]
+    day_offsets = np.sort(rng.random(n_records) * 365).astype(np.int64)
+    dates = np.datetime64('2023-01-01') + day_offsets.astype('timedelta64[D]')
     
     products = ['Laptop', 'Phone', 'Tablet', 'Headphones', 'Mouse', 'Keyboard', 
                 'Monitor', 'Webcam', 'Speaker', 'Charger']
-    product_list = np.random.choice(products, n_records, p=[0.15, 0.20, 0.12, 0.10, 0.08, 0.07, 0.13, 0.05, 0.06, 0.04])
+    product_idx = rng.choice(len(products), n_records, p=[0.15, 0.20, 0.12, 0.10, 0.08, 0.07, 0.13, 0.05, 0.06, 0.04])
     
     category_map = {
         'Laptop': 'Computers', 'Phone': 'Mobile', 'Tablet': 'Mobile',
         'Headphones': 'Accessories', 'Mouse': 'Accessories', 'Keyboard': 'Accessories',
         'Monitor': 'Computers', 'Webcam': 'Accessories', 'Speaker': 'Accessories', 'Charger': 'Accessories'
     }
-    categories = [category_map[p] for p in product_list]
+    category_names = ['Computers', 'Mobile', 'Accessories']
+    category_idx = np.array([category_names.index(category_map[p]) for p in products])[product_idx]
     
     regions = ['North', 'South', 'East', 'West', 'Central']
-    region_list = np.random.choice(regions, n_records, p=[0.22, 0.18, 0.25, 0.20, 0.15])
+    region_idx = rng.choice(len(regions), n_records, p=[0.22, 0.18, 0.25, 0.20, 0.15])
     
     channels = ['Online', 'Retail', 'Partner']
-    channel_list = np.random.choice(channels, n_records, p=[0.45, 0.35, 0.20])
+    channel_idx = rng.choice(len(channels), n_records, p=[0.45, 0.35, 0.20])
     
     segments = ['Enterprise', 'SMB', 'Consumer']
-    segment_list = np.random.choice(segments, n_records, p=[0.25, 0.35, 0.40])
+    segment_idx = rng.choice(len(segments), n_records, p=[0.25, 0.35, 0.40])
     
     base_prices = {
         'Laptop': 1200, 'Phone': 800, 'Tablet': 500, 'Headphones': 150,
@@ -72,80 +85,84 @@ def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
         'Speaker': 120, 'Charger': 30
     }
     
-    prices = [base_prices[p] * np.random.uniform(0.8, 1.2) for p in product_list]
+    base_price_arr = np.array([base_prices[p] for p in products], dtype=np.float64)
+    prices = base_price_arr[product_idx] * rng.uniform(0.8, 1.2, n_records)
     
-    month_multipliers = {1: 0.8, 2: 0.85, 3: 0.9, 4: 1.0, 5: 1.0, 6: 1.1,
-                        7: 1.15, 8: 1.1, 9: 1.0, 10: 1.05, 11: 1.3, 12: 1.4}
-    quantities = []
-    for date in dates:
-        base_qty = np.random.poisson(2) + 1
-        seasonal = month_multipliers[date.month]
-        quantities.append(int(base_qty * seasonal))
+    # Seasonal multipliers indexed by zero-based month (January = 0)
+    month_multipliers = np.array([0.8, 0.85, 0.9, 1.0, 1.0, 1.1,
+                                  1.15, 1.1, 1.0, 1.05, 1.3, 1.4], dtype=np.float32)
+    month_idx = dates.astype('datetime64[M]').astype(np.int64) % 12
+    base_qty = rng.poisson(2, n_records) + 1
+    # Multiply in float32 so exact products (e.g. 5 x 1.4) land on whole numbers
+    quantities = (base_qty.astype(np.float32) * month_multipliers[month_idx]).astype(np.int32)
     
-    revenue = [p * q for p, q in zip(prices, quantities)]
-    costs = [p * np.random.uniform(0.70, 0.85) * q for p, q in zip(prices, quantities)]
-    profit = [r - c for r, c in zip(revenue, costs)]
+    revenue = prices * quantities
+    costs = revenue * rng.uniform(0.70, 0.85, n_records)
+    profit = revenue - costs
     
     n_customers = n_records // 3
-    customer_ids = [f'CUST{i:05d}' for i in np.random.randint(1, n_customers + 1, n_records)]
-    order_ids = [f'ORD{i:06d}' for i in range(1, n_records + 1)]
+    customer_nums = rng.integers(1, n_customers + 1, n_records)
+    customer_ids = np.char.add('CUST', np.char.zfill(customer_nums.astype(str), 5))
+    order_ids = np.char.add('ORD', np.char.zfill(np.arange(1, n_records + 1).astype(str), 6))
     
     reps = [f'Rep_{i:02d}' for i in range(1, 21)]
-    rep_list = np.random.choice(reps, n_records)
+    rep_idx = rng.integers(0, len(reps), n_records)
     
     df = pd.DataFrame({
         'Order_ID': order_ids,
         'Date': dates,
         'Customer_ID': customer_ids,
-        'Product': product_list,
-        'Category': categories,
+        'Product': pd.Categorical.from_codes(product_idx, products),
+        'Category': pd.Categorical.from_codes(category_idx, category_names),
         'Quantity': quantities,
-        'Unit_Price': [round(p, 2) for p in prices],
-        'Revenue': [round(r, 2) for r in revenue],
-        'Cost': [round(c, 2) for c in costs],
-        'Profit': [round(p, 2) for p in profit],
-        'Region': region_list,
-        'Channel': channel_list,
-        'Customer_Segment': segment_list,
-        'Sales_Rep': rep_list
+        'Unit_Price': np.round(prices, 2),
+        'Revenue': np.round(revenue, 2),
+        'Cost': np.round(costs, 2),
+        'Profit': np.round(profit, 2),
+        'Region': pd.Categorical.from_codes(region_idx, regions),
+        'Channel': pd.Categorical.from_codes(channel_idx, channels),
+        'Customer_Segment': pd.Categorical.from_codes(segment_idx, segments),
+        'Sales_Rep': pd.Categorical.from_codes(rep_idx, reps)
     })
     
-    return df
+    return downcast_dtypes(df)
 
 
+@st.cache_data(show_spinner=False)
 def generate_monthly_demo_data(seed: int = 42) -> pd.DataFrame:
     """Generate monthly aggregated demo data."""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     months = pd.date_range('2023-01', '2023-12', freq='MS')
     
     data = {
         'Month': months,
-        'Total_Revenue': np.random.uniform(150000, 250000, 12),
-        'Total_Orders': np.random.randint(400, 700, 12),
-        'Avg_Order_Value': np.random.uniform(300, 500, 12),
-        'Customer_Count': np.random.randint(300, 500, 12),
-        'New_Customers': np.random.randint(50, 120, 12)
+        'Total_Revenue': rng.uniform(150000, 250000, 12),
+        'Total_Orders': rng.integers(400, 700, 12),
+        'Avg_Order_Value': rng.uniform(300, 500, 12),
+        'Customer_Count': rng.integers(300, 500, 12),
+        'New_Customers': rng.integers(50, 120, 12)
     }
     
     df = pd.DataFrame(data)
     df['Total_Revenue'] = df['Total_Revenue'].round(2)
     df['Avg_Order_Value'] = df['Avg_Order_Value'].round(2)
-    return df
+    return downcast_dtypes(df)
 
 
+@st.cache_data(show_spinner=False)
 def generate_top_products_data(seed: int = 42) -> pd.DataFrame:
     """Generate top products demo data."""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     products = ['Laptop Pro', 'Smartphone X', 'Tablet Mini', 'Wireless Headphones', 
                 'Gaming Mouse', 'Mechanical Keyboard', '4K Monitor', 'HD Webcam', 
                 'Bluetooth Speaker', 'Fast Charger']
     
     data = {
         'Product': products,
-        'Units_Sold': np.random.randint(500, 2000, 10),
-        'Revenue': np.random.uniform(50000, 200000, 10),
-        'Avg_Rating': np.random.uniform(3.5, 5.0, 10),
-        'Return_Rate': np.random.uniform(1, 8, 10)
+        'Units_Sold': rng.integers(500, 2000, 10),
+        'Revenue': rng.uniform(50000, 200000, 10),
+        'Avg_Rating': rng.uniform(3.5, 5.0, 10),
+        'Return_Rate': rng.uniform(1, 8, 10)
     }
     
     df = pd.DataFrame(data)
@@ -153,18 +170,23 @@ def generate_top_products_data(seed: int = 42) -> pd.DataFrame:
     df['Revenue'] = df['Revenue'].round(2)
     df['Avg_Rating'] = df['Avg_Rating'].round(1)
     df['Return_Rate'] = df['Return_Rate'].round(2)
-    return df
+    return downcast_dtypes(df)
 
 
+@st.cache_data(show_spinner=False)
 def get_demo_datasets() -> Dict[str, pd.DataFrame]:
     """Get all demo datasets."""
     return {
-        "📊 Детальные продажи (2000 записей)": generate_demo_data(2000),
-        "📅 Месячная статистика (12 месяцев)": generate_monthly_demo_data(),
-        "🏆 Топ продукты (10 товаров)": generate_top_products_data()
+        "📊 Детальные продажи (2000 записей)":
+            load_or_generate('sales_2000_42', lambda: generate_demo_data(2000)),
+        "📅 Месячная статистика (12 месяцев)":
+            load_or_generate('monthly_42', generate_monthly_demo_data),
+        "🏆 Топ продукты (10 товаров)":
+            load_or_generate('top_products_42', generate_top_products_data)
     }
 
 
+@st.cache_data
 def get_demo_description() -> Dict[str, str]:
     """Get descriptions for demo datasets."""
     return {
@@ -189,12 +211,61 @@ def init_session_state():
         st.session_state['current_section'] = 'Загрузка данных'
     if 'data_source' not in st.session_state:
         st.session_state['data_source'] = None
+    if 'column_types' not in st.session_state:
+        st.session_state['column_types'] = None
+
+
+def set_data(df: Optional[pd.DataFrame], source: Optional[str]):
+    """Store the active DataFrame and its column types in session state."""
+    st.session_state['data'] = df
+    st.session_state['data_source'] = source
+    st.session_state['column_types'] = detect_column_types(df) if df is not None else None
 
 
 # ============================================================================
 # DATA LOADING SECTION
 # ============================================================================
 
+CSV_CHUNK_SIZE = 100_000
+
+
+def downcast_integers(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer columns to the smallest dtype that holds their values."""
+    # Column by column, so at most one extra column copy is alive at a time
+    for col in df.select_dtypes(include=['integer']).columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def read_csv_chunked(buffer: io.BytesIO, total_bytes: int) -> pd.DataFrame:
+    """Read CSV in chunks, shrinking integer columns before concatenation."""
+    progress = st.progress(0.0)
+    chunks = []
+    for chunk in pd.read_csv(buffer, chunksize=CSV_CHUNK_SIZE):
+        chunks.append(downcast_integers(chunk))
+        progress.progress(min(1.0, buffer.tell() / max(total_bytes, 1)))
+    progress.empty()
+    return pd.concat(chunks, ignore_index=True)
+
+
+@st.cache_data(show_spinner=False)
+def parse_uploaded_file(raw: bytes, file_extension: str) -> pd.DataFrame:
+    """Parse uploaded file contents, cached on the raw bytes."""
+    if file_extension == 'csv':
+        try:
+            # The multithreaded pyarrow parser reads the whole file at once: faster
+            # than the chunked reader, but without its progress bar and with a full
+            # int64 frame at peak before downcasting. It also parses timestamp
+            # strings into datetime64 columns, which the selectors list separately.
+            return downcast_integers(pd.read_csv(io.BytesIO(raw), engine='pyarrow'))
+        except (ImportError, ValueError):
+            return read_csv_chunked(io.BytesIO(raw), len(raw))
+    try:
+        return pd.read_excel(io.BytesIO(raw), engine='calamine')
+    except (ImportError, ValueError):
+        return pd.read_excel(io.BytesIO(raw))
+
+
 def load_data_section():
     """Data loading section with demo data support."""
     st.title("📊 Sales Analytics Platform")
@@ -211,16 +282,13 @@ def load_data_section():
             with st.spinner('Загрузка файла...'):
                 file_extension = uploaded_file.name.split('.')[-1].lower()
                 
-                if file_extension == 'csv':
-                    df = pd.read_csv(uploaded_file)
-                elif file_extension in ['xlsx', 'xls']:
-                    df = pd.read_excel(uploaded_file)
-                else:
+                if file_extension not in ['csv', 'xlsx', 'xls']:
                     st.error("Неподдерживаемый формат файла")
                     return
                 
-                st.session_state['data'] = df
-                st.session_state['data_source'] = 'uploaded'
+                df = parse_uploaded_file(uploaded_file.getvalue(), file_extension)
+                
+                set_data(df, 'uploaded')
                 st.success(f"✅ Файл загружен! {len(df)} записей.")
                 st.rerun()
                 
@@ -258,12 +326,54 @@ def load_data_section():
     
     if load_demo and selected_demo:
         with st.spinner(f'Загружаю {selected_demo}...'):
-            st.session_state['data'] = demo_datasets[selected_demo]
-            st.session_state['data_source'] = 'demo'
+            set_data(demo_datasets[selected_demo], 'demo')
             st.success(f"✅ {selected_demo} загружен! {len(demo_datasets[selected_demo])} записей.")
             st.rerun()
 
 
+# ============================================================================
+# CACHED COMPUTATIONS
+# ============================================================================
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize the DataFrame to UTF-8 CSV bytes for download."""
+    return df.to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False)
+def describe_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Descriptive statistics for the DataFrame."""
+    return df.describe()
+
+
+@st.cache_data(show_spinner=False)
+def correlation_matrix(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Correlation matrix for the given numeric columns."""
+    return calculate_correlation(df, columns)
+
+
+@st.cache_data(show_spinner=False)
+def count_missing_values(df: pd.DataFrame) -> int:
+    """Total number of missing values in the DataFrame."""
+    return sum(int(col.isna().sum()) for _, col in df.items())
+
+
+@st.cache_data(show_spinner=False)
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """Deep memory usage of the DataFrame in megabytes."""
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+@st.cache_data(show_spinner=False)
+def revenue_summary(revenue: pd.Series) -> Tuple[float, float]:
+    """Total and average revenue from a single pass over the column."""
+    values = revenue.to_numpy(dtype=np.float64, na_value=np.nan)
+    total = float(np.nansum(values))
+    count = int(np.count_nonzero(~np.isnan(values)))
+    return total, total / count if count else float('nan')
+
+
 # ============================================================================
 # DATA OVERVIEW SECTION
 # ============================================================================
@@ -279,17 +389,16 @@ def data_overview_section(df: pd.DataFrame):
     
     with tab1:
         st.dataframe(df, use_container_width=True, height=400)
-        csv = df.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="💾 Скачать данные (CSV)",
-            data=csv,
+            data=to_csv_bytes(df),
             file_name="sales_data.csv",
             mime="text/csv"
         )
     
     with tab2:
         st.markdown("#### Основные статистики")
-        st.dataframe(df.describe(), use_container_width=True)
+        st.dataframe(describe_data(df), use_container_width=True)
     
     with tab3:
         col1, col2 = st.columns(2)
@@ -297,8 +406,8 @@ def data_overview_section(df: pd.DataFrame):
             st.metric("Всего записей", f"{len(df):,}")
             st.metric("Столбцов", len(df.columns))
         with col2:
-            st.metric("Пропущенных значений", df.isnull().sum().sum())
-            st.metric("Размер памяти", f"{df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+            st.metric("Пропущенных значений", count_missing_values(df))
+            st.metric("Размер памяти", f"{memory_usage_mb(df):.2f} MB")
 
 
 # ============================================================================
@@ -309,7 +418,7 @@ def kpi_metrics_section(df: pd.DataFrame):
     """Display KPI metrics."""
     st.markdown("### 📊 Ключевые показатели")
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = st.session_state['column_types']['numeric']
     
     if not numeric_cols:
         st.warning("В данных не найдено числовых столбцов для расчета метрик")
@@ -324,8 +433,7 @@ def kpi_metrics_section(df: pd.DataFrame):
             break
     
     if revenue_col:
-        total_revenue = df[revenue_col].sum()
-        avg_revenue = df[revenue_col].mean()
+        total_revenue, avg_revenue = revenue_summary(df[revenue_col])
         
         with col1:
             st.metric("Общая выручка", f"{total_revenue:,.2f}")
@@ -343,12 +451,110 @@ def kpi_metrics_section(df: pd.DataFrame):
 # VISUALIZATIONS SECTION
 # ============================================================================
 
+MAX_PLOT_POINTS = 5000
+HISTOGRAM_BINS = 50
+
+
+def downsample_rows(df: pd.DataFrame, max_points: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    """Random subsample of rows (original order kept) for point-based charts."""
+    if len(df) <= max_points:
+        return df
+    return df.sample(max_points, random_state=0).sort_index()
+
+
+def binned_histogram(values: pd.Series, title: str) -> "go.Figure":
+    """Histogram from precomputed bin counts instead of raw values."""
+    import plotly.express as px
+    
+    counts, edges = np.histogram(values.dropna().to_numpy(), bins=HISTOGRAM_BINS)
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, title=title,
+                 labels={'x': values.name, 'y': 'count'})
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def _box_stats(values: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Quartiles and 1.5 IQR whisker ends, as Plotly computes them for a box."""
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    lowerfence = values[values >= q1 - 1.5 * iqr].min()
+    upperfence = values[values <= q3 + 1.5 * iqr].max()
+    return q1, median, q3, lowerfence, upperfence
+
+
+def precomputed_box(df: pd.DataFrame, y_col: str, title: str,
+                    x_col: Optional[str] = None) -> "go.Figure":
+    """Box plot from precomputed quartiles instead of shipping every point."""
+    import plotly.graph_objects as go
+    
+    if x_col is None:
+        groups = [(y_col, df[y_col])]
+    else:
+        groups = df.groupby(x_col, observed=True)[y_col]
+    
+    names, stats = [], []
+    for name, series in groups:
+        values = series.dropna().to_numpy(dtype=np.float64)
+        if values.size:
+            names.append(name)
+            stats.append(_box_stats(values))
+    q1, median, q3, lowerfence, upperfence = (list(col) for col in zip(*stats)) if stats else ([],) * 5
+    
+    fig = go.Figure(go.Box(x=names, q1=q1, median=median, q3=q3, lowerfence=lowerfence,
+                           upperfence=upperfence, name=y_col))
+    fig.update_layout(title=title, xaxis_title=x_col, yaxis_title=y_col)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def grouped_sum(df: pd.DataFrame, group_col: str, value_col: str) -> pd.DataFrame:
+    """Sum of a value column per group."""
+    return df.groupby(group_col, observed=True)[value_col].sum().reset_index()
+
+
+@st.cache_data(show_spinner=False)
+def build_chart(df: pd.DataFrame, chart_type: str, x_col: str, y_col: str,
+                x_is_categorical: bool) -> "go.Figure":
+    """Build a Plotly figure for the selected chart type and columns."""
+    import plotly.express as px
+    
+    if chart_type == "Линейный график":
+        fig = px.line(downsample_rows(df), x=x_col, y=y_col, title=f"{y_col} по {x_col}")
+    elif chart_type == "Столбчатая диаграмма":
+        if x_is_categorical:
+            fig = px.bar(grouped_sum(df, x_col, y_col), x=x_col, y=y_col, title=f"{y_col} по {x_col}")
+        else:
+            fig = px.bar(df, x=x_col, y=y_col, title=f"{y_col} по {x_col}")
+    elif chart_type == "Круговая диаграмма":
+        fig = px.pie(grouped_sum(df, x_col, y_col), names=x_col, values=y_col, title=f"Распределение {y_col}")
+    elif chart_type == "Диаграмма рассеяния":
+        fig = px.scatter(downsample_rows(df), x=x_col, y=y_col, title=f"{y_col} vs {x_col}")
+    elif chart_type == "Box plot" and len(df) > MAX_PLOT_POINTS:
+        if x_is_categorical:
+            fig = precomputed_box(df, y_col, f"Распределение {y_col} по {x_col}", x_col)
+        else:
+            fig = precomputed_box(df, y_col, f"Распределение {y_col}")
+    elif chart_type == "Box plot":
+        if x_is_categorical:
+            fig = px.box(df, x=x_col, y=y_col, title=f"Распределение {y_col} по {x_col}")
+        else:
+            fig = px.box(df, y=y_col, title=f"Распределение {y_col}")
+    elif len(df) > MAX_PLOT_POINTS:
+        fig = binned_histogram(df[y_col], title=f"Гистограмма {y_col}")
+    else:
+        fig = px.histogram(df, x=y_col, title=f"Гистограмма {y_col}")
+    
+    fig.update_layout(height=500)
+    return fig
+
+
 def visualizations_section(df: pd.DataFrame):
     """Interactive visualizations section."""
     st.markdown("### 📈 Визуализации")
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    numeric_cols = st.session_state['column_types']['numeric']
+    categorical_cols = st.session_state['column_types']['categorical']
+    datetime_cols = st.session_state['column_types']['datetime']
     
     if not numeric_cols:
         st.warning("В данных не найдено числовых столбцов для визуализации")
@@ -363,37 +569,17 @@ def visualizations_section(df: pd.DataFrame):
     col1, col2 = st.columns(2)
     
     with col1:
-        x_col = st.selectbox("Ось X", categorical_cols + numeric_cols if categorical_cols else numeric_cols)
+        x_col = st.selectbox("Ось X", categorical_cols + datetime_cols + numeric_cols)
     with col2:
         y_col = st.selectbox("Ось Y (числовая)", numeric_cols)
     
+    if chart_type == "Круговая диаграмма" and x_col not in categorical_cols:
+        st.warning("Для круговой диаграммы нужна категориальная переменная на оси X")
+        return
+    
     try:
-        if chart_type == "Линейный график":
-            fig = px.line(df, x=x_col, y=y_col, title=f"{y_col} по {x_col}")
-        elif chart_type == "Столбчатая диаграмма":
-            if x_col in categorical_cols:
-                df_grouped = df.groupby(x_col)[y_col].sum().reset_index()
-                fig = px.bar(df_grouped, x=x_col, y=y_col, title=f"{y_col} по {x_col}")
-            else:
-                fig = px.bar(df, x=x_col, y=y_col, title=f"{y_col} по {x_col}")
-        elif chart_type == "Круговая диаграмма":
-            if x_col in categorical_cols:
-                df_grouped = df.groupby(x_col)[y_col].sum().reset_index()
-                fig = px.pie(df_grouped, names=x_col, values=y_col, title=f"Распределение {y_col}")
-            else:
-                st.warning("Для круговой диаграммы нужна категориальная переменная на оси X")
-                return
-        elif chart_type == "Диаграмма рассеяния":
-            fig = px.scatter(df, x=x_col, y=y_col, title=f"{y_col} vs {x_col}")
-        elif chart_type == "Box plot":
-            if x_col in categorical_cols:
-                fig = px.box(df, x=x_col, y=y_col, title=f"Распределение {y_col} по {x_col}")
-            else:
-                fig = px.box(df, y=y_col, title=f"Распределение {y_col}")
-        elif chart_type == "Гистограмма":
-            fig = px.histogram(df, x=y_col, title=f"Гистограмма {y_col}")
-        
-        fig.update_layout(height=500)
+        chart_df = df[list(dict.fromkeys([x_col, y_col]))]
+        fig = build_chart(chart_df, chart_type, x_col, y_col, x_col in categorical_cols)
         st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
@@ -404,9 +590,29 @@ def visualizations_section(df: pd.DataFrame):
 # ANALYSIS SECTION
 # ============================================================================
 
+@st.cache_resource(show_spinner=False)
+def correlation_figure(corr_matrix: pd.DataFrame) -> "go.Figure":
+    """Heatmap figure for a correlation matrix, shared across reruns."""
+    import plotly.graph_objects as go
+    
+    cols = corr_matrix.columns.tolist()
+    fig = go.Figure(data=go.Heatmap(z=corr_matrix.to_numpy(), x=cols, y=cols,
+                                    colorscale="RdBu", zmin=-1, zmax=1,
+                                    colorbar=dict(title="Корреляция")))
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+# Row count above which grouping and top-N run on polars when it is installed
+POLARS_MIN_ROWS = 100_000
+
+
 def analysis_section(df: pd.DataFrame):
     """Advanced analysis section."""
+    import plotly.express as px
+    
     st.markdown("### 🔍 Анализ данных")
+    engine = 'polars' if len(df) > POLARS_MIN_ROWS else 'pandas'
     
     analysis_type = st.selectbox(
         "Выберите тип анализа",
@@ -414,32 +620,31 @@ def analysis_section(df: pd.DataFrame):
     )
     
     if analysis_type == "Корреляционный анализ":
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        numeric_cols = st.session_state['column_types']['numeric']
         
         if len(numeric_cols) < 2:
             st.warning("Для корреляционного анализа нужно минимум 2 числовых столбца")
             return
         
         st.markdown("#### Матрица корреляций")
-        corr_matrix = df[numeric_cols].corr()
-        fig = px.imshow(corr_matrix, labels=dict(color="Корреляция"),
-                       x=corr_matrix.columns, y=corr_matrix.columns,
-                       color_continuous_scale="RdBu", aspect="auto")
+        fig = correlation_figure(correlation_matrix(df, numeric_cols))
         st.plotly_chart(fig, use_container_width=True)
     
     elif analysis_type == "Топ-N записей":
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        numeric_cols = st.session_state['column_types']['numeric']
         col1, col2 = st.columns(2)
         with col1:
             sort_by = st.selectbox("Сортировать по", numeric_cols)
         with col2:
             n = st.number_input("Количество записей", min_value=1, max_value=100, value=10)
-        top_n = df.nlargest(n, sort_by)
+        top_n = top_n_records(df, sort_by, n, engine=engine)
         st.dataframe(top_n, use_container_width=True)
     
     elif analysis_type == "Группировка данных":
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        # Timestamps parsed by the CSV reader are valid group keys too
+        categorical_cols = (st.session_state['column_types']['categorical']
+                            + st.session_state['column_types']['datetime'])
+        numeric_cols = st.session_state['column_types']['numeric']
         
         if not categorical_cols or not numeric_cols:
             st.warning("Нужны категориальные и числовые столбцы для группировки")
@@ -453,10 +658,12 @@ def analysis_section(df: pd.DataFrame):
         with col3:
             agg_func = st.selectbox("Функция", ["sum", "mean", "count", "min", "max"])
         
-        grouped = df.groupby(group_by)[agg_col].agg(agg_func).reset_index()
-        grouped.columns = [group_by, f"{agg_func}({agg_col})"]
+        agg_name = f"{agg_func}({agg_col})"
+        grouped = group_and_aggregate(df, group_by, agg_col, agg_func, engine=engine)
+        grouped = grouped.rename(columns={agg_col: agg_name})
         st.dataframe(grouped, use_container_width=True)
-        fig = px.bar(grouped, x=group_by, y=f"{agg_func}({agg_col})")
+        fig = px.bar(x=grouped[group_by].to_numpy(), y=grouped[agg_name].to_numpy(),
+                     labels={'x': group_by, 'y': agg_name})
         st.plotly_chart(fig, use_container_width=True)
 
 
@@ -472,8 +679,7 @@ def main():
         st.title("📊 Навигация")
         
         if st.button("🔄 Загрузить новые данные", use_container_width=True):
-            st.session_state['data'] = None
-            st.session_state['data_source'] = None
+            set_data(None, None)
             st.rerun()
         
         st.markdown("---")
@@ -497,6 +703,8 @@ def main():
         load_data_section()
     else:
         df = st.session_state['data']
+        if st.session_state['column_types'] is None:
+            set_data(df, st.session_state['data_source'])
         section = st.session_state.get('current_section', 'Обзор данных')
         
         if section == "Обзор данных":
@@ -5,10 +5,12 @@ Generates realistic demo datasets for demonstration purposes
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 from typing import Dict
 
+from src.caching import cache_data, load_or_generate
 
+
+@cache_data
 def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
     """
     Generate comprehensive demo sales data.
@@ -20,16 +22,17 @@ def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
     Returns:
         DataFrame with demo sales data
     """
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     # Date range
-    start_date = datetime(2023, 1, 1)
-    dates = [start_date + timedelta(days=int(x)) for x in np.sort(np.random.rand(n_records) * 365)]
+    offsets_days = np.sort(rng.random(n_records) * 365).astype('int64')
+    dates = np.datetime64('2023-01-01') + offsets_days.astype('timedelta64[D]')
     
     # Products
     products = ['Laptop', 'Phone', 'Tablet', 'Headphones', 'Mouse', 'Keyboard', 
                 'Monitor', 'Webcam', 'Speaker', 'Charger']
-    product_list = np.random.choice(products, n_records, p=[0.15, 0.20, 0.12, 0.10, 0.08, 0.07, 0.13, 0.05, 0.06, 0.04])
+    product_codes = rng.choice(len(products), n_records, p=[0.15, 0.20, 0.12, 0.10, 0.08, 0.07, 0.13, 0.05, 0.06, 0.04])
+    product_list = np.asarray(products)[product_codes]
     
     # Categories
     category_map = {
@@ -44,19 +47,19 @@ def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
         'Speaker': 'Accessories',
         'Charger': 'Accessories'
     }
-    categories = [category_map[p] for p in product_list]
+    categories = np.array([category_map[p] for p in products])[product_codes]
     
     # Regions
     regions = ['North', 'South', 'East', 'West', 'Central']
-    region_list = np.random.choice(regions, n_records, p=[0.22, 0.18, 0.25, 0.20, 0.15])
+    region_list = rng.choice(regions, n_records, p=[0.22, 0.18, 0.25, 0.20, 0.15])
     
     # Sales channels
     channels = ['Online', 'Retail', 'Partner']
-    channel_list = np.random.choice(channels, n_records, p=[0.45, 0.35, 0.20])
+    channel_list = rng.choice(channels, n_records, p=[0.45, 0.35, 0.20])
     
     # Customer segments
     segments = ['Enterprise', 'SMB', 'Consumer']
-    segment_list = np.random.choice(segments, n_records, p=[0.25, 0.35, 0.40])
+    segment_list = rng.choice(segments, n_records, p=[0.25, 0.35, 0.40])
     
     # Base prices
     base_prices = {
@@ -66,36 +69,40 @@ def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
     }
     
     # Generate prices with variation
-    prices = [base_prices[p] * np.random.uniform(0.8, 1.2) for p in product_list]
+    base_price_arr = np.array([base_prices[p] for p in products], dtype=np.float64)
+    prices = base_price_arr[product_codes] * rng.uniform(0.8, 1.2, n_records)
     
     # Quantities (with seasonal patterns)
     month_multipliers = {1: 0.8, 2: 0.85, 3: 0.9, 4: 1.0, 5: 1.0, 6: 1.1,
                         7: 1.15, 8: 1.1, 9: 1.0, 10: 1.05, 11: 1.3, 12: 1.4}
-    quantities = []
-    for date in dates:
-        base_qty = np.random.poisson(2) + 1
-        seasonal = month_multipliers[date.month]
-        quantities.append(int(base_qty * seasonal))
+    mult = np.array([month_multipliers[m] for m in range(1, 13)])
+    months = pd.DatetimeIndex(dates).month.to_numpy()
+    base_qty = rng.poisson(2, n_records) + 1
+    quantities = (base_qty * mult[months - 1]).astype(np.int64)
     
     # Calculate revenue
-    revenue = [p * q for p, q in zip(prices, quantities)]
+    revenue = prices * quantities
     
     # Costs (70-85% of price)
-    costs = [p * np.random.uniform(0.70, 0.85) * q for p, q, in zip(prices, quantities)]
+    costs = prices * rng.uniform(0.70, 0.85, n_records) * quantities
     
     # Profit
-    profit = [r - c for r, c in zip(revenue, costs)]
+    profit = revenue - costs
+    
+    for arr in (prices, revenue, costs, profit):
+        np.round(arr, 2, out=arr)
     
     # Customer IDs
     n_customers = n_records // 3
-    customer_ids = [f'CUST{i:05d}' for i in np.random.randint(1, n_customers + 1, n_records)]
+    cust_nums = rng.integers(1, n_customers + 1, n_records)
+    customer_ids = np.char.add('CUST', np.char.zfill(cust_nums.astype(str), 5))
     
     # Order IDs
-    order_ids = [f'ORD{i:06d}' for i in range(1, n_records + 1)]
+    order_ids = np.char.add('ORD', np.char.zfill(np.arange(1, n_records + 1).astype(str), 6))
     
     # Sales reps
     reps = [f'Rep_{i:02d}' for i in range(1, 21)]
-    rep_list = np.random.choice(reps, n_records)
+    rep_list = rng.choice(reps, n_records)
     
     # Create DataFrame
     df = pd.DataFrame({
@@ -105,44 +112,51 @@ def generate_demo_data(n_records: int = 2000, seed: int = 42) -> pd.DataFrame:
         'Product': product_list,
         'Category': categories,
         'Quantity': quantities,
-        'Unit_Price': [round(p, 2) for p in prices],
-        'Revenue': [round(r, 2) for r in revenue],
-        'Cost': [round(c, 2) for c in costs],
-        'Profit': [round(p, 2) for p in profit],
+        'Unit_Price': prices,
+        'Revenue': revenue,
+        'Cost': costs,
+        'Profit': profit,
         'Region': region_list,
         'Channel': channel_list,
         'Customer_Segment': segment_list,
         'Sales_Rep': rep_list
     })
     
+    # Low-cardinality text columns as categoricals (integer codes for groupby)
+    for col in ['Product', 'Category', 'Region', 'Channel', 'Customer_Segment', 'Sales_Rep']:
+        df[col] = df[col].astype('category')
+    
     return df
 
 
+@cache_data
 def generate_monthly_demo_data(seed: int = 42) -> pd.DataFrame:
     """Generate monthly aggregated demo data."""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     months = pd.date_range('2023-01', '2023-12', freq='MS')
     
     data = {
         'Month': months,
-        'Total_Revenue': np.random.uniform(150000, 250000, 12),
-        'Total_Orders': np.random.randint(400, 700, 12),
-        'Avg_Order_Value': np.random.uniform(300, 500, 12),
-        'Customer_Count': np.random.randint(300, 500, 12),
-        'New_Customers': np.random.randint(50, 120, 12)
+        'Total_Revenue': rng.uniform(150000, 250000, 12),
+        'Total_Orders': rng.integers(400, 700, 12),
+        'Avg_Order_Value': rng.uniform(300, 500, 12),
+        'Customer_Count': rng.integers(300, 500, 12),
+        'New_Customers': rng.integers(50, 120, 12)
     }
     
+    np.round(data['Total_Revenue'], 2, out=data['Total_Revenue'])
+    np.round(data['Avg_Order_Value'], 2, out=data['Avg_Order_Value'])
+    
     df = pd.DataFrame(data)
-    df['Total_Revenue'] = df['Total_Revenue'].round(2)
-    df['Avg_Order_Value'] = df['Avg_Order_Value'].round(2)
     
     return df
 
 
+@cache_data
 def generate_top_products_data(seed: int = 42) -> pd.DataFrame:
     """Generate top products demo data."""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     products = ['Laptop Pro', 'Smartphone X', 'Tablet Mini', 'Wireless Headphones', 
                 'Gaming Mouse', 'Mechanical Keyboard', '4K Monitor', 'HD Webcam', 
@@ -150,13 +164,14 @@ def generate_top_products_data(seed: int = 42) -> pd.DataFrame:
     
     data = {
         'Product': products,
-        'Units_Sold': np.random.randint(500, 2000, 10),
-        'Revenue': np.random.uniform(50000, 200000, 10),
-        'Avg_Rating': np.random.uniform(3.5, 5.0, 10),
-        'Return_Rate': np.random.uniform(1, 8, 10)
+        'Units_Sold': rng.integers(500, 2000, 10),
+        'Revenue': rng.uniform(50000, 200000, 10),
+        'Avg_Rating': rng.uniform(3.5, 5.0, 10),
+        'Return_Rate': rng.uniform(1, 8, 10)
     }
     
     df = pd.DataFrame(data)
+    df['Product'] = df['Product'].astype('category')
     df = df.sort_values('Revenue', ascending=False)
     df['Revenue'] = df['Revenue'].round(2)
     df['Avg_Rating'] = df['Avg_Rating'].round(1)
@@ -165,6 +180,7 @@ def generate_top_products_data(seed: int = 42) -> pd.DataFrame:
     return df
 
 
+@cache_data
 def get_demo_datasets() -> Dict[str, pd.DataFrame]:
     """
     Get all demo datasets.
@@ -173,9 +189,12 @@ def get_demo_datasets() -> Dict[str, pd.DataFrame]:
         Dictionary with dataset names as keys and DataFrames as values
     """
     return {
-        "📊 Детальные продажи (2000 записей)": generate_demo_data(2000),
-        "📅 Месячная статистика (12 месяцев)": generate_monthly_demo_data(),
-        "🏆 Топ продукты (10 товаров)": generate_top_products_data()
+        "📊 Детальные продажи (2000 записей)":
+            load_or_generate('sales_2000_42', lambda: generate_demo_data(2000)),
+        "📅 Месячная статистика (12 месяцев)":
+            load_or_generate('monthly_42', generate_monthly_demo_data),
+        "🏆 Топ продукты (10 товаров)":
+            load_or_generate('top_products_42', generate_top_products_data)
     }
 
 
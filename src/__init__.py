@@ -1,8 +1,19 @@
 """Sales Analytics Platform - Source Package."""
 
-from . import data_loader
-from . import analysis
-from . import plotting
+import importlib
 
 __version__ = "3.0.0"
 __all__ = ['data_loader', 'analysis', 'plotting']
+
+
+def __getattr__(name):
+    # PEP 562: import submodules (and plotly behind plotting) on first access.
+    if name in __all__:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
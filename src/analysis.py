@@ -4,41 +4,220 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from .data_loader import detect_column_types
+
+
+def _column_values(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Column as a float64 array with missing values dropped."""
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    return values[~np.isnan(values)]
+
 
 def calculate_basic_stats(df: pd.DataFrame, column: str) -> Dict:
     """Calculate basic statistics for a column."""
+    values = _column_values(df, column)
+    if values.size == 0:
+        return {key: np.nan for key in ['mean', 'median', 'std', 'min', 'max', 'q25', 'q75']}
+    
+    q25, median, q75 = np.percentile(values, [25, 50, 75])
     stats = {
-        'mean': df[column].mean(),
-        'median': df[column].median(),
-        'std': df[column].std(),
-        'min': df[column].min(),
-        'max': df[column].max(),
-        'q25': df[column].quantile(0.25),
-        'q75': df[column].quantile(0.75)
+        'mean': values.mean(),
+        'median': median,
+        'std': values.std(ddof=1) if values.size > 1 else np.nan,
+        'min': values.min(),
+        'max': values.max(),
+        'q25': q25,
+        'q75': q75
     }
     return stats
 
 
 def calculate_correlation(df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """Calculate correlation matrix."""
-    if columns:
-        return df[columns].corr()
-    return df.select_dtypes(include=['number']).corr()
+    data = df[columns] if columns else df[detect_column_types(df)['numeric']]
+    values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    # Pairwise NaN handling needs pandas; complete data goes through a single matmul
+    if len(values) < 2 or np.isnan(values).any():
+        return data.corr()
+    
+    centered = values - values.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centered /= np.linalg.norm(centered, axis=0)
+    corr = np.clip(centered.T @ centered, -1.0, 1.0)
+    return pd.DataFrame(corr, index=data.columns, columns=data.columns)
+
+
+FAST_AGG_FUNCS = ('sum', 'mean', 'count', 'min', 'max')
+
+
+def _group_codes(keys: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Integer group codes (-1 for missing) and their sorted labels for a key column."""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        all_codes = np.arange(len(keys.cat.categories))
+        levels = pd.CategoricalIndex(pd.Categorical.from_codes(all_codes, dtype=keys.dtype), name=keys.name)
+        return keys.cat.codes.to_numpy(), levels
+    codes, levels = pd.factorize(keys, sort=True)
+    return codes, pd.Index(levels, name=keys.name)
+
+
+def fast_group_agg(values: np.ndarray, codes: np.ndarray, n_groups: int, op: str) -> np.ndarray:
+    """Aggregate values per group code with NumPy reductions, skipping NaNs.
+    
+    Integer values are reduced in integer arithmetic (sums in 64 bits), so
+    they neither wrap around nor lose precision through float64.
+    """
+    is_int = values.dtype.kind in 'iu'
+    if not is_int:
+        valid = ~np.isnan(values)
+        if not valid.all():
+            codes, values = codes[valid], values[valid]
+    
+    counts = np.bincount(codes, minlength=n_groups)
+    if op == 'count':
+        return counts
+    if op == 'sum':
+        if is_int:
+            out = np.zeros(n_groups, dtype=np.uint64 if values.dtype.kind == 'u' else np.int64)
+            np.add.at(out, codes, values)
+            return out
+        # bincount returns int64 when no weights are left (e.g. an all-NaN column)
+        return np.bincount(codes, weights=values, minlength=n_groups).astype(np.float64, copy=False)
+    if op == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.bincount(codes, weights=values, minlength=n_groups) / counts
+    
+    reducer = np.minimum if op == 'min' else np.maximum
+    if is_int:
+        info = np.iinfo(values.dtype)
+        out = np.full(n_groups, info.max if op == 'min' else info.min, dtype=values.dtype)
+    else:
+        out = np.full(n_groups, np.inf if op == 'min' else -np.inf)
+    reducer.at(out, codes, values)
+    if not is_int:
+        out[counts == 0] = np.nan
+    return out
+
+
+def _import_polars():
+    """The polars module, or None when the optional dependency is not installed."""
+    try:
+        import polars
+    except ImportError:
+        return None
+    return polars
+
+
+def _restore_dtypes(result: pd.DataFrame, source: pd.DataFrame) -> pd.DataFrame:
+    """Give categorical and datetime columns coming back from polars the source dtypes."""
+    for col in result.columns:
+        if col not in source:
+            continue
+        dtype = source[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            result[col] = result[col].cat.set_categories(dtype.categories)
+        elif dtype.kind == 'M' and result[col].dtype != dtype:
+            result[col] = result[col].astype(dtype)
+    return result
 
 
 def group_and_aggregate(df: pd.DataFrame, group_by: str, agg_column: str, 
-                        agg_func: str = 'sum') -> pd.DataFrame:
-    """Group data and aggregate."""
-    return df.groupby(group_by)[agg_column].agg(agg_func).reset_index()
+                        agg_func: str = 'sum', engine: str = 'pandas') -> pd.DataFrame:
+    """Group data and aggregate (engine: 'pandas' or 'polars', falling back to pandas)."""
+    pl = _import_polars() if engine == 'polars' else None
+    if pl is not None:
+        keys = df[group_by]
+        lf = pl.from_pandas(df[[group_by, agg_column]]).lazy().drop_nulls(group_by)
+        expr = getattr(pl.col(agg_column), agg_func)()
+        if agg_func == 'count':
+            expr = expr.cast(pl.Int64)
+        lf = lf.group_by(group_by).agg(expr)
+        if not isinstance(keys.dtype, pd.CategoricalDtype):
+            return _restore_dtypes(lf.sort(group_by).collect().to_pandas(), df)
+        
+        # polars orders categoricals lexically; pandas uses the category order
+        result = _restore_dtypes(lf.collect().to_pandas(), df)
+        return result.sort_values(group_by, ignore_index=True)
+    
+    column = df[agg_column]
+    # Extension dtypes (nullable Int64, Arrow, ...) keep their own result dtypes in pandas
+    if (agg_func not in FAST_AGG_FUNCS or not isinstance(column.dtype, np.dtype)
+            or not is_numeric_dtype(column) or is_bool_dtype(column)):
+        return df.groupby(group_by)[agg_column].agg(agg_func).reset_index()
+    
+    codes, levels = _group_codes(df[group_by])
+    if column.dtype.kind in 'iu':
+        values = column.to_numpy()
+    else:
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    if (codes < 0).any():
+        keep = codes >= 0
+        codes, values = codes[keep], values[keep]
+    result = fast_group_agg(values, codes, len(levels), agg_func)
+    
+    # Only observed groups, as with groupby(observed=True)
+    observed = np.bincount(codes, minlength=len(levels)) > 0
+    levels, result = levels[observed], result[observed]
+    
+    # Match pandas result dtypes: min/max keep the input dtype
+    if agg_func in ('min', 'max'):
+        result = result.astype(column.dtype)
+    return pd.DataFrame({group_by: levels, agg_column: result})
+
+
+def _top_n_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the n largest values, ordered like nlargest(keep='first').
+    
+    Uses a partial selection for the n-th largest value instead of a full sort;
+    ties at that boundary are filled with the earliest rows, and missing values
+    pad the result only when there are fewer than n others.
+    """
+    missing = np.isnan(values) if values.dtype.kind == 'f' else np.zeros(len(values), dtype=bool)
+    valid = np.flatnonzero(~missing)
+    padding = np.flatnonzero(missing)[:max(n - len(valid), 0)]
+    values = values[valid]
+    k = min(n, len(values))
+    if k <= 0:
+        return padding
+    
+    if k < len(values):
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:k - len(above)]
+        keep = np.sort(np.concatenate([above, ties]))
+    else:
+        keep = np.arange(len(values))
+    
+    # Stable descending sort that keeps earlier rows first among equal values
+    order = np.argsort(values[keep][::-1], kind='stable')[::-1]
+    return np.concatenate([valid[keep[len(keep) - 1 - order]], padding])
+
+
+def top_n_records(df: pd.DataFrame, column: str, n: int = 10, engine: str = 'pandas') -> pd.DataFrame:
+    """Get the n records with the largest values in a column (engine: 'pandas' or 'polars', falling back to pandas)."""
+    pl = _import_polars() if engine == 'polars' else None
+    if pl is not None:
+        # Carry the index through polars so rows keep their original labels
+        index_name = df.index.name
+        lf = pl.from_pandas(df.rename_axis('__index__').reset_index()).lazy()
+        top = lf.sort(column, descending=True, nulls_last=True, maintain_order=True).head(n)
+        result = top.collect().to_pandas().set_index('__index__').rename_axis(index_name)
+        return _restore_dtypes(result, df)
+    values = df[column].to_numpy()
+    if not isinstance(df[column].dtype, np.dtype) or values.dtype.kind not in 'iuf':
+        return df.nlargest(n, column)
+    return df.iloc[_top_n_positions(values, n)]
 
 
 def detect_outliers(df: pd.DataFrame, column: str, method: str = 'iqr') -> pd.Series:
     """Detect outliers in a column."""
     if method == 'iqr':
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        Q1, Q3 = np.nanpercentile(values, [25, 75])
         IQR = Q3 - Q1
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
-        return (df[column] < lower_bound) | (df[column] > upper_bound)
+        return pd.Series((values < lower_bound) | (values > upper_bound), index=df.index, name=column)
     return pd.Series([False] * len(df))
@@ -0,0 +1,95 @@
+"""Caching helpers: Streamlit memoization and an on-disk Parquet cache."""
+
+import hashlib
+import inspect
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import streamlit as st
+except ImportError:  # pragma: no cover
+    st = None
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache'
+
+
+def cache_data(func: Optional[Callable] = None, **kwargs):
+    """Memoize with st.cache_data when Streamlit is available."""
+    kwargs.setdefault('show_spinner', False)
+    if st is None:
+        return func if func is not None else (lambda f: f)
+    if func is None:
+        return st.cache_data(**kwargs)
+    return st.cache_data(func, **kwargs)
+
+
+def _cache_key(name: str, func: Callable) -> Tuple[str, str]:
+    """Cache entry key (defining module + name) and a hash of that module's source."""
+    source_file = Path(inspect.getsourcefile(inspect.unwrap(func)))
+    digest = hashlib.sha1(source_file.read_bytes()).hexdigest()[:12]
+    return f"{source_file.stem}_{name}", digest
+
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    """Read a cached frame, restoring datetime units that Parquet cannot store."""
+    import pyarrow.parquet as pq
+
+    df = pd.read_parquet(path, engine='pyarrow')
+    columns = (pq.read_schema(path).pandas_metadata or {}).get('columns', [])
+    units = {c['name']: c['numpy_type'] for c in columns
+             if c['pandas_type'] == 'datetime' and c['name'] in df}
+    return df.astype(units)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, key: str):
+    """Atomically write df to path and drop older versions of the same cache entry."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{key}_", suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_name, compression='zstd')
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+    for stale in path.parent.glob(f"{key}_*.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def load_or_generate(name: str, generate: Callable[[], pd.DataFrame],
+                     cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """
+    Read a generated dataset from the Parquet cache, generating it on first use.
+
+    The cache file name includes the name and a content hash of the module
+    defining ``generate``, so editing the generator regenerates the data.
+    Unreadable cache files are regenerated, and failed writes skip the cache.
+
+    Args:
+        name: Cache entry name
+        generate: Zero-argument callable producing the dataset
+        cache_dir: Directory holding the Parquet files
+
+    Returns:
+        The cached or freshly generated DataFrame
+    """
+    key, digest = _cache_key(name, generate)
+    path = cache_dir / f"{key}_{digest}.parquet"
+    if path.exists():
+        try:
+            return _read_parquet(path)
+        except (ImportError, OSError, ValueError):
+            pass
+
+    df = generate()
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        _write_parquet(df, path, key)
+    except (ImportError, OSError):
+        pass
+    return df
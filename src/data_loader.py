@@ -1,41 +1,77 @@
 """Data loading and preprocessing module."""
 
+import functools
+import os
 import pandas as pd
 import numpy as np
 from typing import Optional, List, Tuple
 from pathlib import Path
 
+from .caching import cache_data
+
+
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    """Modification time and size used to invalidate cached reads."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@cache_data
+def _read_csv_cached(file_path: str, signature: Tuple[int, int]) -> pd.DataFrame:
+    """Read CSV, memoized on path and file signature."""
+    try:
+        return pd.read_csv(file_path, engine='pyarrow')
+    except (ImportError, ValueError):
+        return pd.read_csv(file_path)
+
+
+@cache_data
+def _read_excel_cached(file_path: str, signature: Tuple[int, int], sheet_name) -> pd.DataFrame:
+    """Read Excel sheet, memoized on path and file signature."""
+    return pd.read_excel(file_path, sheet_name=sheet_name)
+
 
 def load_csv(file_path: str) -> pd.DataFrame:
     """Load CSV file into DataFrame."""
-    return pd.read_csv(file_path)
+    return _read_csv_cached(str(file_path), _file_signature(file_path))
 
 
 def load_excel(file_path: str, sheet_name: str = 0) -> pd.DataFrame:
     """Load Excel file into DataFrame."""
-    return pd.read_excel(file_path, sheet_name=sheet_name)
+    return _read_excel_cached(str(file_path), _file_signature(file_path), sheet_name)
+
+
+@functools.lru_cache(maxsize=32)
+def _column_types_for(columns: Tuple, dtypes: Tuple) -> dict:
+    """Classify columns by dtype, memoized on the (columns, dtypes) signature."""
+    # Zero-row frame with positional labels keeps select_dtypes semantics exactly
+    empty = pd.DataFrame({i: pd.Series(dtype=dtype) for i, dtype in enumerate(dtypes)})
+    
+    def names(include: List[str]) -> Tuple:
+        return tuple(columns[i] for i in empty.select_dtypes(include=include).columns)
+    
+    return {
+        'numeric': names(['number']),
+        'categorical': names(['object', 'category']),
+        'datetime': names(['datetime64'])
+    }
 
 
 def detect_column_types(df: pd.DataFrame) -> dict:
     """Detect column types in DataFrame."""
-    types = {
-        'numeric': df.select_dtypes(include=['number']).columns.tolist(),
-        'categorical': df.select_dtypes(include=['object', 'category']).columns.tolist(),
-        'datetime': df.select_dtypes(include=['datetime64']).columns.tolist()
-    }
-    return types
+    types = _column_types_for(tuple(df.columns), tuple(df.dtypes))
+    return {kind: list(cols) for kind, cols in types.items()}
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Clean DataFrame."""
-    df_clean = df.copy()
+def clean_data(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """Clean DataFrame (copy=False cleans the caller's frame in place)."""
+    df_clean = df.copy() if copy else df
     
     # Remove duplicates
-    df_clean = df_clean.drop_duplicates()
+    df_clean.drop_duplicates(inplace=True)
     
     # Fill numeric NaNs with median
-    numeric_cols = df_clean.select_dtypes(include=['number']).columns
-    for col in numeric_cols:
-        df_clean[col].fillna(df_clean[col].median(), inplace=True)
+    numeric_cols = detect_column_types(df_clean)['numeric']
+    df_clean[numeric_cols] = df_clean[numeric_cols].fillna(df_clean[numeric_cols].median())
     
     return df_clean
@@ -1,43 +1,66 @@
 """Plotting and visualization module."""
 
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
+
+from .analysis import calculate_correlation
+from .caching import cache_data
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
 def create_line_chart(df: pd.DataFrame, x: str, y: str, 
-                      title: Optional[str] = None) -> go.Figure:
+                      title: Optional[str] = None) -> "go.Figure":
     """Create a line chart."""
+    import plotly.express as px
+
     fig = px.line(df, x=x, y=y, title=title or f"{y} over {x}")
     return fig
 
 
 def create_bar_chart(df: pd.DataFrame, x: str, y: str, 
-                     title: Optional[str] = None) -> go.Figure:
+                     title: Optional[str] = None) -> "go.Figure":
     """Create a bar chart."""
+    import plotly.express as px
+
     fig = px.bar(df, x=x, y=y, title=title or f"{y} by {x}")
     return fig
 
 
 def create_pie_chart(df: pd.DataFrame, names: str, values: str, 
-                     title: Optional[str] = None) -> go.Figure:
+                     title: Optional[str] = None) -> "go.Figure":
     """Create a pie chart."""
+    import plotly.express as px
+
     fig = px.pie(df, names=names, values=values, title=title or f"Distribution of {values}")
     return fig
 
 
 def create_scatter_plot(df: pd.DataFrame, x: str, y: str, 
-                        title: Optional[str] = None) -> go.Figure:
+                        title: Optional[str] = None) -> "go.Figure":
     """Create a scatter plot."""
+    import plotly.express as px
+
     fig = px.scatter(df, x=x, y=y, title=title or f"{y} vs {x}")
     return fig
 
 
+@cache_data
+def _correlation_figure(corr: pd.DataFrame, title: str) -> "go.Figure":
+    """Build heatmap figure, memoized on the (small) correlation matrix."""
+    import plotly.graph_objects as go
+
+    cols = corr.columns.tolist()
+    fig = go.Figure(data=go.Heatmap(z=corr.to_numpy(), x=cols, y=cols,
+                                    colorscale="RdBu", zmin=-1, zmax=1))
+    fig.update_layout(title=title)
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
 def create_correlation_heatmap(df: pd.DataFrame, 
-                                title: Optional[str] = None) -> go.Figure:
+                                title: Optional[str] = None) -> "go.Figure":
     """Create correlation heatmap."""
-    corr = df.select_dtypes(include=['number']).corr()
-    fig = px.imshow(corr, title=title or "Correlation Heatmap", 
-                    color_continuous_scale="RdBu")
-    return fig
+    corr = calculate_correlation(df)
+    return _correlation_figure(corr, title or "Correlation Heatmap")
@@ -42,3 +42,133 @@ def test_group_and_aggregate():
     assert len(result) == 2
     assert result[result['category'] == 'A']['values'].values[0] == 30
     assert result[result['category'] == 'B']['values'].values[0] == 70
+
+
+def test_calculate_correlation_matches_pandas():
+    """Test correlation matches pandas, including NaN and constant columns."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((50, 3)), columns=['A', 'B', 'C'])
+    df['D'] = 1.0
+    
+    expected = df.corr()
+    
+    pd.testing.assert_frame_equal(analysis.calculate_correlation(df), expected)
+    
+    df.loc[3, 'A'] = np.nan
+    
+    pd.testing.assert_frame_equal(analysis.calculate_correlation(df), df.corr())
+
+
+def test_detect_outliers_iqr():
+    """Test IQR outlier detection."""
+    df = pd.DataFrame({'values': [10, 11, 12, 13, 14, 100, np.nan]})
+    
+    outliers = analysis.detect_outliers(df, 'values')
+    
+    assert outliers.tolist() == [False, False, False, False, False, True, False]
+    assert outliers.index.equals(df.index)
+
+
+def test_group_and_aggregate_polars_engine():
+    """Test polars engine matches pandas grouping."""
+    pytest.importorskip('polars')
+    df = pd.DataFrame({
+        'category': ['B', 'A', 'B', 'A'],
+        'values': [10, 20, 30, 40]
+    })
+    
+    result = analysis.group_and_aggregate(df, 'category', 'values', 'sum', engine='polars')
+    
+    assert result['category'].tolist() == ['A', 'B']
+    assert result['values'].tolist() == [60, 40]
+
+
+def test_top_n_records():
+    """Test top-N selection with both engines."""
+    df = pd.DataFrame({'values': [5, 1, np.nan, 9, 3]})
+    
+    assert analysis.top_n_records(df, 'values', 2)['values'].tolist() == [9, 5]
+    
+    pytest.importorskip('polars')
+    assert analysis.top_n_records(df, 'values', 2, engine='polars')['values'].tolist() == [9, 5]
+
+
+@pytest.mark.parametrize('agg_func', ['sum', 'mean', 'count', 'min', 'max'])
+def test_group_and_aggregate_matches_pandas(agg_func):
+    """Test code-based aggregation matches pandas groupby, including NaNs."""
+    df = pd.DataFrame({
+        'category': pd.Categorical(['b', 'a', 'b', None, 'c', 'c'], categories=['c', 'b', 'a', 'unused']),
+        'values': [1.0, 2.0, np.nan, 4.0, np.nan, np.nan]
+    })
+    
+    result = analysis.group_and_aggregate(df, 'category', 'values', agg_func)
+    expected = df.groupby('category', observed=True)['values'].agg(agg_func).reset_index()
+    
+    assert result['category'].tolist() == expected['category'].tolist()
+    np.testing.assert_allclose(result['values'], expected['values'])
+
+
+@pytest.mark.parametrize('agg_func', ['sum', 'mean', 'count', 'min', 'max'])
+@pytest.mark.parametrize('dtype', ['int8', 'uint8', 'Int64', 'int64'])
+def test_group_and_aggregate_integer_dtypes(agg_func, dtype):
+    """Test integer aggregation neither wraps around nor changes result dtypes."""
+    high = {'int8': 100, 'uint8': 200, 'Int64': 100, 'int64': 2 ** 53 + 1}[dtype]
+    df = pd.DataFrame({
+        'category': pd.Categorical(['a', 'b'] * 10, categories=['b', 'a', 'unused']),
+        'values': pd.array([high, 1] * 10, dtype=dtype)
+    })
+    
+    result = analysis.group_and_aggregate(df, 'category', 'values', agg_func)
+    expected = df.groupby('category', observed=True)['values'].agg(agg_func).reset_index()
+    
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_top_n_records_ties_match_nlargest():
+    """Test boundary ties and missing values are handled like nlargest(keep='first')."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'values': rng.poisson(2, 200)}, index=rng.permutation(200))
+    df['with_nan'] = df['values'].where(df['values'] > 1)
+    
+    for column, n in [('values', 10), ('values', 200), ('with_nan', 10), ('with_nan', 150)]:
+        expected = df.nlargest(n, column).index.tolist()
+        assert analysis.top_n_records(df, column, n).index.tolist() == expected
+
+
+def test_polars_engine_matches_pandas_semantics():
+    """Test polars drops missing keys, keeps category order and preserves the index."""
+    pytest.importorskip('polars')
+    df = pd.DataFrame({
+        'category': pd.Categorical(['b', 'a', None, 'c', 'b'], categories=['c', 'b', 'a']),
+        'values': [1.0, 2.0, 3.0, 4.0, 5.0]
+    }, index=[12, 10, 11, 13, 14])
+    
+    result = analysis.group_and_aggregate(df, 'category', 'values', 'sum', engine='polars')
+    expected = df.groupby('category', observed=True)['values'].sum().reset_index()
+    
+    pd.testing.assert_frame_equal(result, expected)
+    
+    top = analysis.top_n_records(df, 'values', 2, engine='polars')
+    
+    pd.testing.assert_frame_equal(top, df.nlargest(2, 'values'))
+
+
+def test_group_and_aggregate_all_nan_sum_is_float():
+    """Test an all-NaN float column still sums to float64 zeros like pandas."""
+    df = pd.DataFrame({'category': ['a', 'b', 'a'], 'values': [np.nan] * 3})
+    
+    result = analysis.group_and_aggregate(df, 'category', 'values', 'sum')
+    expected = df.groupby('category')['values'].sum().reset_index()
+    
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_polars_engine_falls_back_without_polars(monkeypatch):
+    """Test engine='polars' uses pandas when polars is not installed."""
+    monkeypatch.setattr(analysis, '_import_polars', lambda: None)
+    df = pd.DataFrame({'category': ['B', 'A', 'B'], 'values': [10, 20, 30]})
+    
+    result = analysis.group_and_aggregate(df, 'category', 'values', 'sum', engine='polars')
+    
+    pd.testing.assert_frame_equal(result, analysis.group_and_aggregate(df, 'category', 'values', 'sum'))
+    assert analysis.top_n_records(df, 'values', 1, engine='polars').index.tolist() == [2]
@@ -0,0 +1,34 @@
+"""Tests for caching module."""
+
+import pandas as pd
+import numpy as np
+from src import caching
+
+
+def _make_frame():
+    return pd.DataFrame({
+        'date': np.datetime64('2023-01-01') + np.arange(3).astype('timedelta64[D]'),
+        'product': pd.Categorical(['a', 'b', 'a']),
+        'value': np.float32([1.5, 2.5, 3.5])
+    })
+
+
+def test_load_or_generate_round_trip(tmp_path):
+    """Test cached reads return the same frame and dtypes as generation."""
+    generated = caching.load_or_generate('frame', _make_frame, cache_dir=tmp_path)
+    cached = caching.load_or_generate('frame', _make_frame, cache_dir=tmp_path)
+    
+    pd.testing.assert_frame_equal(cached, generated)
+    assert [p.name.startswith('test_caching_frame_') for p in tmp_path.iterdir()] == [True]
+
+
+def test_load_or_generate_recovers_from_corrupt_file(tmp_path):
+    """Test a truncated cache file is regenerated instead of raising."""
+    caching.load_or_generate('frame', _make_frame, cache_dir=tmp_path)
+    path = next(tmp_path.glob('*.parquet'))
+    path.write_bytes(path.read_bytes()[:100])
+    
+    result = caching.load_or_generate('frame', _make_frame, cache_dir=tmp_path)
+    
+    pd.testing.assert_frame_equal(result, _make_frame())
+    pd.testing.assert_frame_equal(caching.load_or_generate('frame', _make_frame, cache_dir=tmp_path), result)
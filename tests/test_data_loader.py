@@ -35,3 +35,70 @@ def test_clean_data():
     
     # Check NaNs filled
     assert cleaned['A'].isna().sum() == 0
+
+
+def test_load_csv_rereads_changed_file(tmp_path):
+    """Test that cached CSV loads pick up file changes."""
+    path = tmp_path / 'sales.csv'
+    pd.DataFrame({'A': [1, 2]}).to_csv(path, index=False)
+    
+    assert len(data_loader.load_csv(str(path))) == 2
+    
+    pd.DataFrame({'A': [1, 2, 3]}).to_csv(path, index=False)
+    
+    assert len(data_loader.load_csv(str(path))) == 3
+
+
+def test_load_csv_detects_text_columns(tmp_path):
+    """Test loaded CSV text columns are still detected as categorical."""
+    path = tmp_path / 'sales.csv'
+    pd.DataFrame({'region': ['North', 'South'], 'revenue': [1.5, 2.5]}).to_csv(path, index=False)
+    
+    types = data_loader.detect_column_types(data_loader.load_csv(str(path)))
+    
+    assert types['categorical'] == ['region']
+    assert types['numeric'] == ['revenue']
+
+
+def test_load_csv_detects_timestamp_columns(tmp_path):
+    """Test timestamp strings parsed by the CSV reader are reported as datetime columns."""
+    path = tmp_path / 'sales.csv'
+    pd.DataFrame({
+        'date': ['2023-01-01 10:00:00', '2023-01-02 11:30:00'],
+        'region': ['North', 'South'],
+        'revenue': [1.5, 2.5]
+    }).to_csv(path, index=False)
+    
+    df = data_loader.load_csv(str(path))
+    types = data_loader.detect_column_types(df)
+    
+    assert types['datetime'] == ['date']
+    assert types['categorical'] == ['region']
+    assert df['date'].iloc[1] == pd.Timestamp('2023-01-02 11:30:00')
+
+
+def test_detect_column_types_returns_fresh_lists():
+    """Test cached column types are not shared between callers."""
+    df = pd.DataFrame({'num': [1, 2], 'cat': ['a', 'b']})
+    
+    types = data_loader.detect_column_types(df)
+    types['numeric'].append('extra')
+    
+    assert data_loader.detect_column_types(df)['numeric'] == ['num']
+
+
+def test_clean_data_copy_flag():
+    """Test clean_data leaves the input alone unless copy=False."""
+    df = pd.DataFrame({'A': [1.0, np.nan, 3.0, 3.0]})
+    
+    cleaned = data_loader.clean_data(df)
+    
+    assert df['A'].isna().sum() == 1
+    assert len(df) == 4
+    assert len(cleaned) == 3
+    
+    in_place = data_loader.clean_data(df, copy=False)
+    
+    assert in_place is df
+    assert df['A'].isna().sum() == 0
+    assert len(df) == 3
@@ -29,3 +29,20 @@ def test_create_bar_chart():
     
     assert fig is not None
     assert len(fig.data) > 0
+
+
+def test_create_correlation_heatmap():
+    """Test correlation heatmap creation returns independent figures."""
+    df = pd.DataFrame({
+        'a': [1, 2, 3, 4],
+        'b': [2, 4, 5, 9],
+        'label': ['w', 'x', 'y', 'z']
+    })
+    
+    fig = plotting.create_correlation_heatmap(df)
+    fig.update_layout(title="Changed")
+    
+    again = plotting.create_correlation_heatmap(df)
+    
+    assert len(again.data) > 0
+    assert again.layout.title.text == "Correlation Heatmap"